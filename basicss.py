@@ -3,19 +3,28 @@ ExpirySense - Professional Food Inventory Management System
 A comprehensive application for tracking food expiry dates and reducing waste
 """
 
+from __future__ import annotations
+
 import streamlit as st
 from datetime import datetime, date
-from PIL import Image
-import pandas as pd
-from rapidfuzz import fuzz
-import random
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+import numpy as np
+from rapidfuzz import process, fuzz, utils
+from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
+from dataclasses import dataclass, field
 import json
+import hashlib
+import hmac
+import os
+from collections import defaultdict
+import functools
+
+# pandas and PIL are imported where used so the login page renders without paying for them
+if TYPE_CHECKING:
+    import pandas as pd
 
 # ========================= DATA MODELS =========================
 
-@dataclass
+@dataclass(slots=True)
 class FoodItem:
     """Data model for food items"""
     name: str
@@ -25,7 +34,7 @@ class FoodItem:
     
     def __post_init__(self):
         if self.added_date is None:
-            self.added_date = datetime.now().date()
+            self.added_date = _today()
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
@@ -46,7 +55,7 @@ class FoodItem:
             category=data.get('category', 'Other')
         )
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     """Data model for recipes"""
     name: str
@@ -55,25 +64,70 @@ class Recipe:
     nutrition: Dict[str, int]
     prep_time: str = "30 mins"
     difficulty: str = "Medium"
+    _ingredients_lower: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _ing_set: frozenset = field(init=False, repr=False, compare=False)
+    id: str = field(init=False, repr=False, compare=False)
     
-    def matches_ingredients(self, available_ingredients: List[str]) -> int:
-        """Calculate how many ingredients match"""
-        matching_count = sum(
-            fuzz.partial_ratio(ingredient.lower(), recipe_ing.lower()) > 80 
-            for ingredient in available_ingredients 
-            for recipe_ing in self.ingredients
-        )
-        return matching_count
+    def __post_init__(self):
+        self.id = hashlib.blake2b(self.name.encode(), digest_size=4).hexdigest()
+        self._ingredients_lower = tuple(utils.default_process(ing) for ing in self.ingredients)
+        self._ing_set = frozenset(self._ingredients_lower)
 
 
 # ========================= CONSTANTS =========================
 
+# scrypt cost parameters for password hashing (about 16 MiB and tens of ms per derivation)
+_SCRYPT_PARAMS = {'n': 2 ** 14, 'r': 8, 'p': 1, 'dklen': 32}
+_SALT_BYTES = 16
+
+ITEM_COLUMNS = ['name', 'expiry_date', 'added_date', 'category']
+
+# Dates carry no time of day; pandas has no day unit, so use the coarsest one
+_DATE_DTYPE = 'datetime64[s]'
+
 FOOD_CATEGORIES = [
     "Dairy", "Vegetables", "Fruits", "Meat", "Seafood", 
     "Grains", "Bakery", "Beverages", "Condiments", "Other"
 ]
 
-DAILY_TAGLINES = [
+_FOOD_CATEGORIES_SET = frozenset(FOOD_CATEGORIES)
+
+# Alphabetical so the categorical column sorts the same as plain strings
+_CATEGORY_SORT_ORDER = tuple(sorted(FOOD_CATEGORIES))
+
+_CATEGORY_FILTER_OPTIONS = ["All"] + FOOD_CATEGORIES
+
+_STATUS_COLORS = {
+    "expired": "#FFB3BA",
+    "expires_today": "#FFDFBA",
+    "critical": "#FFFFBA",
+    "warning": "#BAFFC9",
+    "fresh": "#BAE1FF"
+}
+
+_STATUS_ICONS = {
+    "expired": "🚨",
+    "expires_today": "⚠️",
+    "critical": "⏰",
+    "warning": "📌",
+    "fresh": "✅"
+}
+
+# Inventory sort options -> column to sort by (names sort case-insensitively)
+_INVENTORY_SORT_COLUMNS = {
+    "Name": 'name',
+    "Expiry Date": 'expiry_date',
+    "Category": 'category',
+    "Days Until Expiry": 'days_left'
+}
+_INVENTORY_SORT_OPTIONS = list(_INVENTORY_SORT_COLUMNS)
+
+# Expiry statuses in priority order, and the inclusive days-left upper edges separating them
+_STATUS_ORDER = ["expired", "expires_today", "critical", "warning", "fresh"]
+_STATUS_EDGES = np.array([-1, 0, 3, 7])
+_STATUS_LABELS = {status: status.replace("_", " ").title() for status in _STATUS_ORDER}
+
+DAILY_TAGLINES = (
     "Freshness First: Track, Save, Enjoy!",
     "Keep Your Kitchen Fresh and Organized!",
     "Never Let Your Food Go to Waste!",
@@ -84,9 +138,9 @@ DAILY_TAGLINES = [
     "Say Goodbye to Food Waste!",
     "Fresh Food, Happy Life!",
     "Organize Your Pantry Like a Pro!"
-]
+)
 
-MOCK_RECIPES = [
+MOCK_RECIPES = (
     Recipe(
         name="Pasta Primavera",
         ingredients=["pasta", "vegetables", "olive oil", "garlic", "parmesan"],
@@ -223,168 +277,243 @@ MOCK_RECIPES = [
         prep_time="40 mins",
         difficulty="Hard"
     )
-]
+)
 
 
 # ========================= STYLING =========================
 
+_CUSTOM_CSS = """
+<style>
+/* Main container styles */
+.main {
+    background-color: #000000;
+    color: #FFFFFF;
+}
+
+.stApp {
+    max-width: 1400px;
+    margin: 0 auto;
+}
+
+/* Tab styles */
+.stTabs [data-baseweb="tab-list"] {
+    gap: 24px;
+    background-color: #0a0a0a;
+    padding: 10px;
+    border-radius: 10px;
+}
+
+.stTabs [data-baseweb="tab"] {
+    height: 50px;
+    white-space: pre-wrap;
+    background-color: #1a1a1a;
+    color: #FFFFFF;
+    border-radius: 8px;
+    gap: 1px;
+    padding: 10px 20px;
+    font-weight: 500;
+    transition: all 0.3s ease;
+}
+
+.stTabs [aria-selected="true"] {
+    background-color: #333333;
+    border-bottom: 3px solid #4ECDC4;
+}
+
+/* Tab section headers */
+.stTabs [data-testid="stHeading"] h2 {
+    color: #4ECDC4;
+}
+
+/* Title styles */
+.title {
+    font-size: 50px;
+    font-weight: bold;
+    color: #FFFFFF;
+    text-align: center;
+    text-transform: uppercase;
+    letter-spacing: 3px;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+    background: linear-gradient(45deg, #FF6B6B, #4ECDC4);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    padding: 10px;
+    border-radius: 10px;
+    margin-bottom: 20px;
+}
+
+/* Card styles */
+.info-card {
+    background-color: #1a1a1a;
+    border-radius: 10px;
+    padding: 20px;
+    margin: 10px 0;
+    border-left: 4px solid #4ECDC4;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.3);
+}
+
+.stat-card {
+    background: linear-gradient(135deg, #1a1a1a 0%, #2a2a2a 100%);
+    border-radius: 15px;
+    padding: 20px;
+    text-align: center;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.3);
+    border: 1px solid #333;
+}
+
+/* Button styles */
+.stButton > button {
+    background-color: #4ECDC4;
+    color: #000000;
+    font-weight: 600;
+    border-radius: 8px;
+    padding: 10px 24px;
+    border: none;
+    transition: all 0.3s ease;
+}
+
+.stButton > button:hover {
+    background-color: #3DBDB3;
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(78, 205, 196, 0.3);
+}
+
+/* Input styles */
+.stTextInput > div > div > input,
+.stSelectbox > div > div > select,
+.stDateInput > div > div > input {
+    background-color: #1a1a1a;
+    color: #FFFFFF;
+    border: 1px solid #333;
+    border-radius: 8px;
+}
+
+/* Expander styles */
+.streamlit-expanderHeader {
+    background-color: #1a1a1a;
+    border-radius: 8px;
+    color: #FFFFFF;
+}
+
+/* Alert styles */
+.alert-expired {
+    background-color: #FFB3BA;
+    padding: 15px;
+    border-radius: 10px;
+    color: #000000;
+    margin: 10px 0;
+    border-left: 5px solid #FF0000;
+}
+
+.alert-warning {
+    background-color: #FFDFBA;
+    padding: 15px;
+    border-radius: 10px;
+    color: #000000;
+    margin: 10px 0;
+    border-left: 5px solid #FFA500;
+}
+
+.alert-info {
+    background-color: #BAE1FF;
+    padding: 15px;
+    border-radius: 10px;
+    color: #000000;
+    margin: 10px 0;
+    border-left: 5px solid #0080FF;
+}
+
+/* DataFrame styles */
+.dataframe {
+    background-color: #1a1a1a !important;
+}
+
+/* Three-column metadata row */
+.meta-grid {
+    display: grid;
+    grid-template-columns: repeat(3, 1fr);
+    gap: 8px;
+}
+
+/* Expiry alert card */
+.alert-card {
+    padding: 15px;
+    border-radius: 10px;
+    color: #000000;
+    margin: 10px 0;
+    border-left: 5px solid #000;
+}
+
+/* Success message */
+.success-message {
+    background-color: #BAFFC9;
+    padding: 15px;
+    border-radius: 10px;
+    color: #000000;
+    border-left: 5px solid #00FF00;
+}
+</style>
+"""
+
+
+_NUTRITION_TMPL = """
+<div style='background-color: #1a1a1a; padding: 10px; border-radius: 5px; margin: 10px 0;'>
+    <strong>Nutritional Information (per serving):</strong><br>
+    🔥 Calories: {calories} kcal<br>
+    💪 Protein: {protein} g<br>
+    🥑 Fat: {fat} g<br>
+    🌾 Carbs: {carbohydrates} g
+</div>
+"""
+
+_STAT_CARD_TMPL = """
+<div class='stat-card'>
+    <h2 style='color: {color};'>{value}</h2>
+    <p>{label}</p>
+</div>
+"""
+
+# (statistics key, value color, label) for each dashboard card
+_STAT_CARDS = (
+    ('total_items', '#4ECDC4', 'Total Items'),
+    ('expired_count', '#FF6B6B', 'Expired'),
+    ('expiring_soon', '#FFD93D', 'Expiring Soon'),
+    ('fresh_items', '#6BCB77', 'Fresh Items')
+)
+
+_ALERT_CARD_TMPL = "<div class='alert-card' style='background-color: {color};'>{message}</div>"
+
+# Alert wording by bucket: expired, today, tomorrow, later
+_ALERT_MESSAGES = (
+    "<b>{name}</b> expired {days} day(s) ago! 🚨",
+    "<b>{name}</b> expires TODAY! ⚠️",
+    "<b>{name}</b> expires TOMORROW! ⏰",
+    "<b>{name}</b> expires in {days} day(s)"
+)
+
+
 def apply_custom_styles():
     """Apply custom CSS styles to the application"""
-    st.markdown("""
-        <style>
-        /* Main container styles */
-        .main {
-            background-color: #000000;
-            color: #FFFFFF;
-        }
-        
-        .stApp {
-            max-width: 1400px;
-            margin: 0 auto;
-        }
-        
-        /* Tab styles */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 24px;
-            background-color: #0a0a0a;
-            padding: 10px;
-            border-radius: 10px;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            height: 50px;
-            white-space: pre-wrap;
-            background-color: #1a1a1a;
-            color: #FFFFFF;
-            border-radius: 8px;
-            gap: 1px;
-            padding: 10px 20px;
-            font-weight: 500;
-            transition: all 0.3s ease;
-        }
-        
-        .stTabs [aria-selected="true"] {
-            background-color: #333333;
-            border-bottom: 3px solid #4ECDC4;
-        }
-        
-        /* Title styles */
-        .title {
-            font-size: 50px;
-            font-weight: bold;
-            color: #FFFFFF;
-            text-align: center;
-            text-transform: uppercase;
-            letter-spacing: 3px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-            background: linear-gradient(45deg, #FF6B6B, #4ECDC4);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            padding: 10px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        
-        /* Card styles */
-        .info-card {
-            background-color: #1a1a1a;
-            border-radius: 10px;
-            padding: 20px;
-            margin: 10px 0;
-            border-left: 4px solid #4ECDC4;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.3);
-        }
-        
-        .stat-card {
-            background: linear-gradient(135deg, #1a1a1a 0%, #2a2a2a 100%);
-            border-radius: 15px;
-            padding: 20px;
-            text-align: center;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.3);
-            border: 1px solid #333;
-        }
-        
-        /* Button styles */
-        .stButton > button {
-            background-color: #4ECDC4;
-            color: #000000;
-            font-weight: 600;
-            border-radius: 8px;
-            padding: 10px 24px;
-            border: none;
-            transition: all 0.3s ease;
-        }
-        
-        .stButton > button:hover {
-            background-color: #3DBDB3;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(78, 205, 196, 0.3);
-        }
-        
-        /* Input styles */
-        .stTextInput > div > div > input,
-        .stSelectbox > div > div > select,
-        .stDateInput > div > div > input {
-            background-color: #1a1a1a;
-            color: #FFFFFF;
-            border: 1px solid #333;
-            border-radius: 8px;
-        }
-        
-        /* Expander styles */
-        .streamlit-expanderHeader {
-            background-color: #1a1a1a;
-            border-radius: 8px;
-            color: #FFFFFF;
-        }
-        
-        /* Alert styles */
-        .alert-expired {
-            background-color: #FFB3BA;
-            padding: 15px;
-            border-radius: 10px;
-            color: #000000;
-            margin: 10px 0;
-            border-left: 5px solid #FF0000;
-        }
-        
-        .alert-warning {
-            background-color: #FFDFBA;
-            padding: 15px;
-            border-radius: 10px;
-            color: #000000;
-            margin: 10px 0;
-            border-left: 5px solid #FFA500;
-        }
-        
-        .alert-info {
-            background-color: #BAE1FF;
-            padding: 15px;
-            border-radius: 10px;
-            color: #000000;
-            margin: 10px 0;
-            border-left: 5px solid #0080FF;
-        }
-        
-        /* DataFrame styles */
-        .dataframe {
-            background-color: #1a1a1a !important;
-        }
-        
-        /* Success message */
-        .success-message {
-            background-color: #BAFFC9;
-            padding: 15px;
-            border-radius: 10px;
-            color: #000000;
-            border-left: 5px solid #00FF00;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+    st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
 
 
 # ========================= SESSION STATE MANAGEMENT =========================
 
+def _today() -> date:
+    """Get today's date, computed once per rerun"""
+    today = st.session_state.get('_today_cache')
+    if today is None:
+        today = st.session_state['_today_cache'] = date.today()
+    return today
+
+
+def _refresh_today():
+    """Roll the cached date over once per rerun, including fragment reruns"""
+    today = date.today()
+    if st.session_state.get('_today_cache', date.min) < today:
+        st.session_state['_today_cache'] = today
+
+
 class SessionManager:
     """Manage session state variables"""
     
@@ -409,16 +538,50 @@ class SessionManager:
         return f'food_items_{username}'
     
     @staticmethod
-    def get_user_items(username: str) -> List[Dict]:
-        """Get food items for a specific user"""
+    def empty_items_frame() -> pd.DataFrame:
+        """Create an empty food items DataFrame with the canonical columns"""
+        import pandas as pd
+        
+        return pd.DataFrame({
+            'name': pd.Series(dtype=str),
+            'expiry_date': pd.Series(dtype=_DATE_DTYPE),
+            'added_date': pd.Series(dtype=_DATE_DTYPE),
+            'category': pd.Series(dtype=pd.CategoricalDtype(_CATEGORY_SORT_ORDER))
+        })
+    
+    @staticmethod
+    def items_to_frame(items: List[Dict]) -> pd.DataFrame:
+        """Convert a list of food item dicts to a DataFrame"""
+        import pandas as pd
+        
+        if not items:
+            return SessionManager.empty_items_frame()
+        
+        frame = pd.DataFrame.from_records(items, columns=ITEM_COLUMNS)
+        frame['expiry_date'] = pd.to_datetime(frame['expiry_date']).astype(_DATE_DTYPE)
+        frame['added_date'] = pd.to_datetime(frame['added_date']).astype(_DATE_DTYPE)
+        # Categories repeat across items, so store them as small integer codes
+        frame['category'] = (
+            frame['category']
+            .where(frame['category'].isin(_FOOD_CATEGORIES_SET), 'Other')
+            .astype(pd.CategoricalDtype(_CATEGORY_SORT_ORDER))
+        )
+        return frame
+    
+    @staticmethod
+    def get_user_frame(username: str) -> pd.DataFrame:
+        """Get food items for a specific user as a DataFrame"""
         key = SessionManager.get_user_items_key(username)
-        return st.session_state.get(key, [])
+        frame = st.session_state.get(key)
+        if frame is None:
+            return SessionManager.empty_items_frame()
+        return frame
     
     @staticmethod
-    def set_user_items(username: str, items: List[Dict]):
-        """Set food items for a specific user"""
+    def set_user_frame(username: str, frame: pd.DataFrame):
+        """Set food items for a specific user from a DataFrame"""
         key = SessionManager.get_user_items_key(username)
-        st.session_state[key] = items
+        st.session_state[key] = frame.reset_index(drop=True)
 
 
 # ========================= AUTHENTICATION =========================
@@ -426,6 +589,11 @@ class SessionManager:
 class AuthenticationManager:
     """Handle user authentication"""
     
+    @staticmethod
+    def _hash_password(password: str, salt: bytes) -> bytes:
+        """Derive a password hash from the password and the user's salt"""
+        return hashlib.scrypt(password.encode(), salt=salt, **_SCRYPT_PARAMS)
+    
     @staticmethod
     def login(username: str, password: str) -> bool:
         """Authenticate user login"""
@@ -433,7 +601,9 @@ class AuthenticationManager:
             st.error("Username and password are required.")
             return False
         
-        if username in st.session_state.users and st.session_state.users[username] == password:
+        # Unknown users still pay for one derivation and fail like a wrong password
+        salt, stored_hash = st.session_state.users.get(username, (os.urandom(_SALT_BYTES), b''))
+        if hmac.compare_digest(stored_hash, AuthenticationManager._hash_password(password, salt)):
             st.session_state.authenticated = True
             st.session_state.username = username
             st.session_state.last_login = datetime.now()
@@ -459,7 +629,8 @@ class AuthenticationManager:
             st.error("Username already exists. Please choose a different username.")
             return False
         
-        st.session_state.users[username] = password
+        salt = os.urandom(_SALT_BYTES)
+        st.session_state.users[username] = (salt, AuthenticationManager._hash_password(password, salt))
         st.success("✅ Signup successful! Please log in with your credentials.")
         return True
     
@@ -482,54 +653,60 @@ class InventoryManager:
         Add new food items to inventory
         Returns: (added_count, skipped_count)
         """
-        food_items = SessionManager.get_user_items(username)
-        added_count = 0
-        skipped_count = 0
+        import pandas as pd
         
-        for item in new_items:
-            if not item['name'].strip():
-                skipped_count += 1
-                continue
-            
-            # Check for duplicates
-            is_duplicate = any(
-                existing_item['name'].lower() == item['name'].lower() and 
-                existing_item['expiry_date'] == item['expiry_date']
-                for existing_item in food_items
-            )
-            
-            if is_duplicate:
-                st.warning(f"⚠️ Item '{item['name']}' with the same expiry date already exists.")
-                skipped_count += 1
-            else:
-                food_items.append(item)
-                added_count += 1
+        frame = SessionManager.get_user_frame(username)
+        new_frame = SessionManager.items_to_frame(
+            [item for item in new_items if item['name'].strip()]
+        )
+        skipped_count = len(new_items) - len(new_frame)
+        
+        if new_frame.empty:
+            return 0, skipped_count
         
-        SessionManager.set_user_items(username, food_items)
-        return added_count, skipped_count
+        # Match on (lowercased name, expiry) against the inventory and within the batch
+        new_keys = pd.MultiIndex.from_arrays([new_frame['name'].str.lower(), new_frame['expiry_date']])
+        is_duplicate = new_keys.duplicated()
+        if not frame.empty:
+            # Hashed membership test, linear in inventory plus batch size
+            existing_keys = pd.MultiIndex.from_arrays([frame['name'].str.lower(), frame['expiry_date']])
+            is_duplicate |= new_keys.isin(existing_keys)
+        
+        for name in new_frame.loc[is_duplicate, 'name']:
+            st.warning(f"⚠️ Item '{name}' with the same expiry date already exists.")
+        
+        added = new_frame[~is_duplicate]
+        if not added.empty:
+            frame = added if frame.empty else pd.concat([frame, added], ignore_index=True)
+            SessionManager.set_user_frame(username, frame)
+        
+        return len(added), skipped_count + int(is_duplicate.sum())
     
     @staticmethod
-    def delete_item(username: str, item_name: str) -> bool:
-        """Delete a food item from inventory"""
-        food_items = SessionManager.get_user_items(username)
-        original_count = len(food_items)
-        
-        food_items = [item for item in food_items if item['name'] != item_name]
-        SessionManager.set_user_items(username, food_items)
+    def delete_rows(username: str, row_labels: pd.Index) -> int:
+        """
+        Delete food items by their row labels in the stored inventory
+        Returns: Number of items removed
+        """
+        frame = SessionManager.get_user_frame(username)
+        remaining = frame.drop(index=row_labels, errors='ignore')
+        SessionManager.set_user_frame(username, remaining)
         
-        return len(food_items) < original_count
+        return len(frame) - len(remaining)
     
     @staticmethod
     def clear_all(username: str):
         """Clear all items from inventory"""
-        SessionManager.set_user_items(username, [])
+        SessionManager.set_user_frame(username, SessionManager.empty_items_frame())
     
     @staticmethod
     def get_statistics(username: str) -> Dict:
         """Get inventory statistics"""
-        items = SessionManager.get_user_items(username)
+        import pandas as pd
         
-        if not items:
+        frame = SessionManager.get_user_frame(username)
+        
+        if frame.empty:
             return {
                 'total_items': 0,
                 'expired_count': 0,
@@ -537,13 +714,14 @@ class InventoryManager:
                 'fresh_items': 0
             }
         
-        today = datetime.now().date()
-        expired = sum(1 for item in items if item['expiry_date'] < today)
-        expiring_soon = sum(1 for item in items if 0 <= (item['expiry_date'] - today).days <= 5)
-        fresh = len(items) - expired - expiring_soon
+        today = pd.Timestamp(_today())
+        diff = (frame['expiry_date'] - today).dt.days
+        expired = int((diff < 0).sum())
+        expiring_soon = int(((diff >= 0) & (diff <= 5)).sum())
+        fresh = len(frame) - expired - expiring_soon
         
         return {
-            'total_items': len(items),
+            'total_items': len(frame),
             'expired_count': expired,
             'expiring_soon': expiring_soon,
             'fresh_items': fresh
@@ -556,51 +734,89 @@ class ExpiryChecker:
     """Handle expiry date calculations"""
     
     @staticmethod
-    def calculate_days_until_expiry(expiry_date: date) -> int:
-        """Calculate days until expiry"""
-        today = datetime.now().date()
-        return (expiry_date - today).days
-    
-    @staticmethod
-    def get_expiry_status(days_until_expiry: int) -> str:
-        """Get expiry status category"""
-        if days_until_expiry < 0:
-            return "expired"
-        elif days_until_expiry == 0:
-            return "expires_today"
-        elif days_until_expiry <= 3:
-            return "critical"
-        elif days_until_expiry <= 7:
-            return "warning"
-        else:
-            return "fresh"
-    
-    @staticmethod
-    def get_status_color(status: str) -> str:
-        """Get color for status"""
-        colors = {
-            "expired": "#FFB3BA",
-            "expires_today": "#FFDFBA",
-            "critical": "#FFFFBA",
-            "warning": "#BAFFC9",
-            "fresh": "#BAE1FF"
+    def with_expiry_status(frame: pd.DataFrame) -> pd.DataFrame:
+        """Add vectorized days_left and status columns to a food items DataFrame"""
+        import pandas as pd
+        
+        days_left = (frame['expiry_date'] - pd.Timestamp(_today())).dt.days
+        # Index into _STATUS_ORDER for every item in one vectorized pass
+        codes = np.searchsorted(_STATUS_EDGES, days_left.to_numpy(), side='left')
+        status = pd.Categorical.from_codes(codes, categories=_STATUS_ORDER)
+        return frame.assign(days_left=days_left, status=status)
+
+
+# ========================= RECIPE SYSTEM =========================
+
+class RecipeIndex:
+    """Lookup structures precomputed over a recipe corpus"""
+    
+    def __init__(self, recipes: Tuple[Recipe, ...]):
+        # Keep the instances the tables were built from, shared across reruns
+        self.recipes = recipes
+        # Flattened view of every recipe's normalized ingredients
+        self.all_ingredients = [ing for recipe in recipes for ing in recipe._ingredients_lower]
+        # Many recipes share ingredients, so score each distinct string once and fan out
+        self.unique_ingredients = list(dict.fromkeys(self.all_ingredients))
+        position = {ing: slot for slot, ing in enumerate(self.unique_ingredients)}
+        self.corpus_slots = np.array([position[ing] for ing in self.all_ingredients], dtype=np.intp)
+        # Start offset of each non-empty recipe's slice within the flattened corpus
+        lengths = np.array([len(recipe._ingredients_lower) for recipe in recipes], dtype=np.intp)
+        self.recipe_count = len(recipes)
+        self.nonempty = np.flatnonzero(lengths)
+        self.offsets = (np.cumsum(lengths) - lengths)[self.nonempty]
+        # Inverted index: normalized ingredient -> indices of recipes listing it verbatim
+        self.exact_recipes: Dict[str, List[int]] = {}
+        for idx, recipe in enumerate(recipes):
+            for ing in recipe._ing_set:
+                self.exact_recipes.setdefault(ing, []).append(idx)
+        # Nutrition card HTML per recipe name
+        self.nutrition_cards = {
+            recipe.name: _NUTRITION_TMPL.format_map(defaultdict(lambda: 'N/A', recipe.nutrition))
+            for recipe in recipes
         }
-        return colors.get(status, "#FFFFFF")
+        # Memoize per instance so results survive reruns along with the index
+        self.match = functools.lru_cache(maxsize=128)(self._match)
     
-    @staticmethod
-    def get_status_icon(status: str) -> str:
-        """Get icon for status"""
-        icons = {
-            "expired": "🚨",
-            "expires_today": "⚠️",
-            "critical": "⏰",
-            "warning": "📌",
-            "fresh": "✅"
-        }
-        return icons.get(status, "ℹ️")
+    def _match(self, ingredients: frozenset, limit: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        Score the corpus against a normalized ingredient set
+        Returns: Tuple of (recipe_index, match_count) pairs sorted by relevance
+        """
+        query = list(ingredients)
+        # partial_ratio rather than a plain Indel ratio: short queries must still
+        # match inside longer ingredients ('chicken' -> 'chicken breast')
+        scores = process.cdist(
+            query,
+            self.unique_ingredients,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=80,
+            dtype=np.uint8
+        )
+        hits = (scores > 80).astype(np.int32)[:, self.corpus_slots]
+        
+        # Tally matching (query, ingredient) pairs per (query, recipe) segment
+        per_recipe = np.zeros((len(query), self.recipe_count), dtype=np.int32)
+        if len(self.offsets):
+            per_recipe[:, self.nonempty] = np.add.reduceat(hits, self.offsets, axis=1)
+        
+        # A query naming a recipe ingredient verbatim counts exactly once for that recipe,
+        # however many of its other ingredients it also fuzzy-matches
+        for row, ing in enumerate(query):
+            per_recipe[row, self.exact_recipes.get(ing, ())] = 1
+        
+        match_counts = per_recipe.sum(axis=0)
+        matched = np.flatnonzero(match_counts)
+        
+        # Rank by match count (descending); the stable sort keeps corpus order among ties
+        top = matched[np.argsort(-match_counts[matched], kind='stable')[:limit]]
+        return tuple((int(idx), int(match_counts[idx])) for idx in top)
 
 
-# ========================= RECIPE SYSTEM =========================
+@st.cache_resource
+def _recipe_index() -> RecipeIndex:
+    """Build the recipe index once per process rather than on every script rerun"""
+    return RecipeIndex(MOCK_RECIPES)
+
 
 class RecipeEngine:
     """Handle recipe suggestions"""
@@ -611,55 +827,62 @@ class RecipeEngine:
         Get recipes matching the given ingredients
         Returns: List of (Recipe, match_count) tuples sorted by relevance
         """
-        suggested_recipes = []
-        
-        for recipe in MOCK_RECIPES:
-            match_count = recipe.matches_ingredients(ingredients)
-            if match_count > 0:
-                suggested_recipes.append((recipe, match_count))
-        
-        # Sort by match count (descending)
-        suggested_recipes.sort(key=lambda x: x[1], reverse=True)
-        
-        return suggested_recipes[:limit]
+        # Normalizing into a set also drops duplicate inventory entries
+        key = frozenset(utils.default_process(ing) for ing in ingredients)
+        index = _recipe_index()
+        return [(index.recipes[idx], match_count) for idx, match_count in index.match(key, limit)]
     
     @staticmethod
-    def format_recipe_card(recipe: Recipe, matching_ingredients: List[str]) -> str:
+    def format_recipe_card(recipe: Recipe) -> str:
         """Format recipe information as HTML"""
-        matched = [ing for ing in recipe.ingredients 
-                  if ing.lower() in [item.lower() for item in matching_ingredients]]
-        
-        nutrition_html = f"""
-        <div style='background-color: #1a1a1a; padding: 10px; border-radius: 5px; margin: 10px 0;'>
-            <strong>Nutritional Information (per serving):</strong><br>
-            🔥 Calories: {recipe.nutrition.get('calories', 'N/A')} kcal<br>
-            💪 Protein: {recipe.nutrition.get('protein', 'N/A')} g<br>
-            🥑 Fat: {recipe.nutrition.get('fat', 'N/A')} g<br>
-            🌾 Carbs: {recipe.nutrition.get('carbohydrates', 'N/A')} g
-        </div>
-        """
-        
-        return nutrition_html
+        return _recipe_index().nutrition_cards[recipe.name]
 
 
 # ========================= UI COMPONENTS =========================
 
+# Header logo display width in pixels
+_LOGO_WIDTH = 120
+
+
+@st.cache_resource
+def _load_logo() -> Optional[bytes]:
+    """Load the application logo once per process, scaled and encoded for display"""
+    import io
+    from PIL import Image
+    
+    try:
+        with Image.open("logo2.png.webp") as logo:
+            height = round(logo.height * _LOGO_WIDTH / logo.width)
+            thumbnail = logo.resize((_LOGO_WIDTH, height), Image.LANCZOS)
+    except FileNotFoundError:
+        return None
+    
+    # Already at display size and in the output format, so st.image serves it as-is
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _tagline_for(ordinal: int) -> str:
+    """Get the tagline for a given day"""
+    return DAILY_TAGLINES[ordinal % len(DAILY_TAGLINES)]
+
+
 def render_header():
     """Render application header with logo and title"""
-    try:
-        logo = Image.open("logo2.png.webp")
+    logo = _load_logo()
+    if logo is not None:
         col1, col2 = st.columns([1, 5])
         with col1:
-            st.image(logo, width=120)
+            st.image(logo, width=_LOGO_WIDTH, output_format="PNG")
         with col2:
             st.markdown("<h1 class='title'>ExpirySense</h1>", unsafe_allow_html=True)
-    except FileNotFoundError:
+    else:
         st.markdown("<h1 class='title'>ExpirySense</h1>", unsafe_allow_html=True)
         st.caption("ℹ️ Logo file not found. Place 'logo2.png.webp' in the app directory.")
     
     # Display daily tagline
-    random.seed(datetime.now().date().toordinal())
-    tagline = random.choice(DAILY_TAGLINES)
+    tagline = _tagline_for(_today().toordinal())
     st.markdown(f"<p style='font-size: 22px; color: #4ECDC4; text-align: center; font-weight: 500;'>💡 {tagline}</p>", unsafe_allow_html=True)
 
 
@@ -668,39 +891,13 @@ def render_statistics_dashboard(username: str):
     stats = InventoryManager.get_statistics(username)
     
     st.markdown("### 📊 Inventory Overview")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(f"""
-        <div class='stat-card'>
-            <h2 style='color: #4ECDC4;'>{stats['total_items']}</h2>
-            <p>Total Items</p>
-        </div>
-        """, unsafe_allow_html=True)
     
-    with col2:
-        st.markdown(f"""
-        <div class='stat-card'>
-            <h2 style='color: #FF6B6B;'>{stats['expired_count']}</h2>
-            <p>Expired</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class='stat-card'>
-            <h2 style='color: #FFD93D;'>{stats['expiring_soon']}</h2>
-            <p>Expiring Soon</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
-        <div class='stat-card'>
-            <h2 style='color: #6BCB77;'>{stats['fresh_items']}</h2>
-            <p>Fresh Items</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, (stat_key, color, label) in zip(st.columns(4), _STAT_CARDS):
+        with col:
+            st.markdown(
+                _STAT_CARD_TMPL.format(color=color, value=stats[stat_key], label=label),
+                unsafe_allow_html=True
+            )
 
 
 def render_login_page():
@@ -744,7 +941,7 @@ def render_login_page():
 
 def render_add_items_tab(username: str):
     """Render add items tab"""
-    st.markdown("<h2 style='color: #4ECDC4;'>➕ Add New Items</h2>", unsafe_allow_html=True)
+    st.header("➕ Add New Items", anchor=False)
     
     st.info("💡 **Tip:** Add items as soon as you purchase them to track their freshness effectively!")
     
@@ -779,7 +976,7 @@ def render_add_items_tab(username: str):
             with col2:
                 expiry_date = st.date_input(
                     f"Expiry Date", 
-                    min_value=datetime.now().date(), 
+                    min_value=_today(), 
                     key=f"item_expiry_{i}",
                     help="Select the expiration date from the product packaging",
                     label_visibility="visible"
@@ -798,7 +995,7 @@ def render_add_items_tab(username: str):
                     "name": name.strip(),
                     "expiry_date": expiry_date,
                     "category": category,
-                    "added_date": datetime.now().date()
+                    "added_date": _today()
                 })
             
             if i < int(num_items) - 1:
@@ -821,13 +1018,18 @@ def render_add_items_tab(username: str):
                 st.error("❌ No valid items to add. Please fill in at least one item name.")
 
 
+@st.fragment
 def render_inventory_tab(username: str):
     """Render inventory management tab"""
-    st.markdown("<h2 style='color: #4ECDC4;'>📦 Food Inventory</h2>", unsafe_allow_html=True)
+    import pandas as pd
+    
+    _refresh_today()
     
-    items = SessionManager.get_user_items(username)
+    st.header("📦 Food Inventory", anchor=False)
     
-    if not items:
+    frame = SessionManager.get_user_frame(username)
+    
+    if frame.empty:
         st.info("📭 Your inventory is empty. Start by adding some items!")
         return
     
@@ -838,50 +1040,56 @@ def render_inventory_tab(username: str):
         search_term = st.text_input("🔍 Search items", placeholder="Search by name...", key="search_inventory")
     
     with col2:
-        sort_by = st.selectbox("📊 Sort by", ["Name", "Expiry Date", "Category", "Days Until Expiry"])
+        sort_by = st.selectbox("📊 Sort by", _INVENTORY_SORT_OPTIONS)
     
     with col3:
-        filter_category = st.selectbox("🏷️ Filter by Category", ["All"] + FOOD_CATEGORIES)
+        filter_category = st.selectbox("🏷️ Filter by Category", _CATEGORY_FILTER_OPTIONS)
     
-    # Filter items
-    filtered_items = items.copy()
+    # Filter items with a single combined mask
+    mask = np.ones(len(frame), dtype=bool)
     
     if search_term:
-        filtered_items = [item for item in filtered_items if search_term.lower() in item['name'].lower()]
+        mask &= frame['name'].str.contains(search_term, case=False, regex=False, na=False).to_numpy()
     
     if filter_category != "All":
-        filtered_items = [item for item in filtered_items if item.get('category', 'Other') == filter_category]
-    
-    # Sort items
-    if sort_by == "Name":
-        filtered_items.sort(key=lambda x: x['name'].lower())
-    elif sort_by == "Expiry Date":
-        filtered_items.sort(key=lambda x: x['expiry_date'])
-    elif sort_by == "Category":
-        filtered_items.sort(key=lambda x: x.get('category', 'Other'))
-    elif sort_by == "Days Until Expiry":
-        filtered_items.sort(key=lambda x: ExpiryChecker.calculate_days_until_expiry(x['expiry_date']))
+        mask &= (frame['category'] == filter_category).to_numpy()
+    
+    view = frame[mask]
+    
+    # Compute days left and status as columns, then sort
+    view = ExpiryChecker.with_expiry_status(view)
+    sort_column = _INVENTORY_SORT_COLUMNS[sort_by]
+    view = view.sort_values(
+        sort_column,
+        key=(lambda col: col.str.lower()) if sort_column == 'name' else None,
+        kind='stable'
+    )
     
     # Display results count
-    st.markdown(f"**Showing {len(filtered_items)} of {len(items)} items**")
+    st.markdown(f"**Showing {len(view)} of {len(frame)} items**")
     
     # Create DataFrame
-    if filtered_items:
-        data = []
-        for item in filtered_items:
-            days_left = ExpiryChecker.calculate_days_until_expiry(item['expiry_date'])
-            status = ExpiryChecker.get_expiry_status(days_left)
-            
-            data.append({
-                "Item Name": item['name'],
-                "Category": item.get('category', 'Other'),
-                "Expiry Date": item['expiry_date'].strftime("%Y-%m-%d"),
-                "Days Left": days_left,
-                "Status": status.replace("_", " ").title()
-            })
-        
-        df = pd.DataFrame(data)
-        st.dataframe(df, use_container_width=True, height=400)
+    if not view.empty:
+        # Assemble from raw arrays so pandas skips index alignment
+        df = pd.DataFrame({
+            "Item Name": view['name'].to_numpy(),
+            "Category": view['category'].to_numpy(),
+            "Expiry Date": view['expiry_date'].to_numpy(),
+            "Days Left": view['days_left'].to_numpy(),
+            "Status": view['status'].map(_STATUS_LABELS).to_numpy(),
+            "Delete": False
+        })
+        edited = st.data_editor(
+            df,
+            column_config={
+                "Expiry Date": st.column_config.DateColumn("Expiry Date", format="YYYY-MM-DD"),
+                "Delete": st.column_config.CheckboxColumn("Delete", help="Tick items to delete", default=False)
+            },
+            disabled=[col for col in df.columns if col != "Delete"],
+            num_rows="fixed",
+            use_container_width=True,
+            height=400
+        )
         
         # Bulk actions
         st.markdown("---")
@@ -890,8 +1098,18 @@ def render_inventory_tab(username: str):
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("**Delete Individual Items:**")
-            st.caption("*Double-click on a button to confirm deletion*")
+            # The view keeps the stored frame's row labels, so ticks map straight back to rows
+            to_delete = view.index[edited["Delete"].to_numpy()]
+            if st.button(
+                f"🗑️ Delete Selected ({len(to_delete)})",
+                key="delete_selected_button",
+                disabled=to_delete.empty,
+                help="Remove the items ticked in the table"
+            ):
+                deleted_count = InventoryManager.delete_rows(username, to_delete)
+                st.success(f"✅ Deleted {deleted_count} item(s) from inventory")
+                st.rerun()
+            st.caption("*Tick the Delete column in the table to select items*")
         
         with col2:
             if st.button("🗑️ Clear All Items", key="clear_all_button", help="Remove all items from inventory"):
@@ -903,129 +1121,99 @@ def render_inventory_tab(username: str):
                 else:
                     st.session_state.confirm_clear = True
                     st.warning("⚠️ Click again to confirm clearing all items.")
-        
-        # Delete individual items
-        cols = st.columns(3)
-        for idx, item in enumerate(filtered_items):
-            with cols[idx % 3]:
-                days_left = ExpiryChecker.calculate_days_until_expiry(item['expiry_date'])
-                status_icon = ExpiryChecker.get_status_icon(ExpiryChecker.get_expiry_status(days_left))
-                
-                if st.button(
-                    f"{status_icon} {item['name']} ({days_left}d)", 
-                    key=f"delete_{item['name']}_{idx}",
-                    help=f"Click to delete {item['name']}"
-                ):
-                    if InventoryManager.delete_item(username, item['name']):
-                        st.success(f"✅ Deleted '{item['name']}' from inventory")
-                        st.rerun()
     else:
         st.warning("🔍 No items match your search criteria.")
 
 
+@st.fragment
 def render_alerts_tab(username: str):
     """Render expiry alerts tab"""
-    st.markdown("<h2 style='color: #4ECDC4;'>🚨 Expiry Alerts</h2>", unsafe_allow_html=True)
+    _refresh_today()
+    st.header("🚨 Expiry Alerts", anchor=False)
     
-    items = SessionManager.get_user_items(username)
+    frame = SessionManager.get_user_frame(username)
     
-    if not items:
+    if frame.empty:
         st.info("📭 No items in inventory. Add items to see expiry alerts.")
         return
     
-    # Categorize items by status
-    categorized = {
-        "expired": [],
-        "expires_today": [],
-        "critical": [],
-        "warning": [],
-        "fresh": []
-    }
-    
-    for item in items:
-        days_left = ExpiryChecker.calculate_days_until_expiry(item['expiry_date'])
-        status = ExpiryChecker.get_expiry_status(days_left)
-        categorized[status].append((item, days_left))
-    
-    # Display alerts by priority
-    priority_order = ["expired", "expires_today", "critical", "warning", "fresh"]
-    
-    for status in priority_order:
-        status_items = categorized[status]
-        
-        if not status_items:
-            continue
-        
-        status_icon = ExpiryChecker.get_status_icon(status)
-        status_color = ExpiryChecker.get_status_color(status)
-        
-        st.markdown(f"### {status_icon} {status.replace('_', ' ').title()} ({len(status_items)} items)")
+    alerts = ExpiryChecker.with_expiry_status(frame)
+    
+    # Pick each item's message wording in one vectorized pass
+    days = alerts['days_left'].to_numpy()
+    alerts = alerts.assign(
+        message_kind=np.select([days < 0, days == 0, days == 1], [0, 1, 2], default=3)
+    )
+    
+    # Group items by status; the categorical status column keeps priority order
+    html_chunks = []
+    for status, status_items in alerts.groupby('status', observed=True, sort=True):
+        status_color = _STATUS_COLORS[status]
         
-        for item, days_left in status_items:
-            if days_left < 0:
-                message = f"<b>{item['name']}</b> expired {abs(days_left)} day(s) ago! 🚨"
-            elif days_left == 0:
-                message = f"<b>{item['name']}</b> expires TODAY! ⚠️"
-            elif days_left == 1:
-                message = f"<b>{item['name']}</b> expires TOMORROW! ⏰"
-            else:
-                message = f"<b>{item['name']}</b> expires in {days_left} day(s)"
-            
-            st.markdown(
-                f"<div style='background-color: {status_color}; padding: 15px; border-radius: 10px; "
-                f"color: #000000; margin: 10px 0; border-left: 5px solid #000;'>"
-                f"{message}</div>",
-                unsafe_allow_html=True
+        html_chunks.append(
+            f"### {_STATUS_ICONS[status]} {_STATUS_LABELS[status]} ({len(status_items)} items)\n\n"
+        )
+        html_chunks.extend(
+            _ALERT_CARD_TMPL.format(
+                color=status_color,
+                message=_ALERT_MESSAGES[kind].format(name=name, days=abs(days_left))
             )
+            for name, days_left, kind in zip(
+                status_items['name'], status_items['days_left'], status_items['message_kind']
+            )
+        )
+        html_chunks.append("\n\n")
+    
+    # One markdown element for the whole tab instead of two per status group
+    st.markdown("".join(html_chunks), unsafe_allow_html=True)
 
 
+@st.fragment
 def render_recipes_tab(username: str):
     """Render magic recipes tab"""
-    st.markdown("<h2 style='color: #4ECDC4;'>🍳 Magic Recipes</h2>", unsafe_allow_html=True)
+    import pandas as pd
+    
+    _refresh_today()
+    st.header("🍳 Magic Recipes", anchor=False)
     
     st.info("💡 **Smart Recipe Suggestions:** Select ingredients that are expiring soon, and we'll suggest delicious recipes to help reduce food waste!")
     
-    items = SessionManager.get_user_items(username)
+    frame = SessionManager.get_user_frame(username)
     
-    # Get items expiring soon (within 7 days)
-    near_expiry = []
-    for item in items:
-        days_left = ExpiryChecker.calculate_days_until_expiry(item['expiry_date'])
-        if 0 <= days_left <= 7:
-            near_expiry.append((item, days_left))
+    # Get items expiring soon (within 7 days), soonest first; only those need a status
+    today = pd.Timestamp(_today())
+    near = frame[frame['expiry_date'].between(today, today + pd.Timedelta(days=7))]
+    near = ExpiryChecker.with_expiry_status(near).sort_values('days_left', kind='stable')
+    near_expiry = list(zip(near['name'], near['days_left'], near['status']))
     
     if not near_expiry:
         st.warning("⚠️ No items are expiring soon. Check back later or add more items to your inventory!")
         return
     
-    # Sort by days left (ascending)
-    near_expiry.sort(key=lambda x: x[1])
-    
     st.markdown("### 🛒 Select Ingredients")
     st.caption(f"Found {len(near_expiry)} item(s) expiring within 7 days")
     
-    # Display selectable items
-    selected_items = []
-    
-    cols = st.columns(3)
-    for idx, (item, days_left) in enumerate(near_expiry):
-        with cols[idx % 3]:
-            status_icon = ExpiryChecker.get_status_icon(ExpiryChecker.get_expiry_status(days_left))
-            if st.checkbox(
-                f"{status_icon} {item['name']} ({days_left}d left)",
-                key=f"recipe_checkbox_{item['name']}_{idx}"
-            ):
-                selected_items.append(item)
+    # Options are item names, so a pick survives its days-left label changing;
+    # a name listed more than once is labelled with its soonest expiry
+    labels = {}
+    for name, days_left, status in near_expiry:
+        labels.setdefault(name, f"{_STATUS_ICONS[status]} {name} ({days_left}d left)")
+    ingredient_names = st.multiselect(
+        "Ingredients to use",
+        list(labels),
+        format_func=labels.__getitem__,
+        key="recipe_select",
+        placeholder="Choose ingredients expiring soon..."
+    )
     
-    if not selected_items:
+    if not ingredient_names:
         st.info("👆 Select one or more ingredients above to get recipe suggestions.")
         return
     
     st.markdown("---")
-    st.markdown(f"### 🎯 Selected: {', '.join([item['name'] for item in selected_items])}")
+    st.markdown(f"### 🎯 Selected: {', '.join(ingredient_names)}")
     
     # Get recipe suggestions
-    ingredient_names = [item['name'] for item in selected_items]
     recipes = RecipeEngine.get_matching_recipes(ingredient_names)
     
     if not recipes:
@@ -1034,64 +1222,100 @@ def render_recipes_tab(username: str):
     
     st.markdown(f"### 📖 Recipe Suggestions ({len(recipes)} found)")
     
-    # Display recipes
+    selected_lower = [utils.default_process(name) for name in ingredient_names]
+    
+    # Display recipes; details are only built once a recipe has been opened
+    opened = st.session_state.setdefault('opened_recipes', set())
+    
     for recipe, match_count in recipes:
-        with st.expander(f"⭐ **{recipe.name}** ({match_count} matching ingredients)"):
-            # Recipe metadata
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown(f"**⏱️ Prep Time:** {recipe.prep_time}")
-            with col2:
-                st.markdown(f"**📊 Difficulty:** {recipe.difficulty}")
-            with col3:
-                calories = recipe.nutrition.get('calories', 'N/A')
-                st.markdown(f"**🔥 Calories:** {calories} kcal")
-            
-            st.markdown("---")
-            
-            # Ingredients
-            st.markdown("**🥘 Ingredients:**")
-            for ing in recipe.ingredients:
-                is_matched = any(fuzz.partial_ratio(ing.lower(), item['name'].lower()) > 80 for item in selected_items)
-                if is_matched:
-                    st.markdown(f"- ✅ {ing} *(from your inventory)*")
-                else:
-                    st.markdown(f"- {ing}")
-            
-            st.markdown("---")
-            
-            # Instructions
-            st.markdown("**👨‍🍳 Instructions:**")
-            st.markdown(recipe.instructions)
-            
-            st.markdown("---")
-            
-            # Nutrition
-            nutrition_html = RecipeEngine.format_recipe_card(recipe, ingredient_names)
-            st.markdown(nutrition_html, unsafe_allow_html=True)
-            
-            # Feedback section
-            st.markdown("---")
-            st.markdown("**💬 Share Your Feedback:**")
-            feedback_key = f"feedback_{recipe.name}_{hash(recipe.name)}"
-            feedback = st.text_area(
-                "Did you try this recipe? Let us know how it turned out!",
-                key=feedback_key,
-                placeholder="Share your experience, modifications, or suggestions..."
-            )
-            
-            if st.button(f"Submit Feedback", key=f"submit_feedback_{recipe.name}"):
-                if feedback.strip():
-                    if 'feedback' not in st.session_state:
-                        st.session_state.feedback = {}
-                    st.session_state.feedback[recipe.name] = {
-                        'user': username,
-                        'feedback': feedback,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    st.success("✅ Thank you for your feedback!")
-                else:
-                    st.warning("⚠️ Please enter some feedback before submitting.")
+        with st.expander(f"⭐ **{recipe.name}** ({match_count} matching ingredients)", expanded=recipe.id in opened):
+            if recipe.id in opened:
+                render_recipe_details(recipe, selected_lower, username)
+            else:
+                st.caption(f"⏱️ {recipe.prep_time} · 📊 {recipe.difficulty}")
+                st.button(
+                    "📖 Show Recipe",
+                    key=f"open_recipe_{recipe.id}",
+                    on_click=opened.add,
+                    args=(recipe.id,)
+                )
+
+
+def render_recipe_details(recipe: Recipe, selected_lower: List[str], username: str):
+    """Render the full body of a recipe suggestion"""
+    # Recipe metadata
+    calories = recipe.nutrition.get('calories', 'N/A')
+    st.markdown(
+        "<div class='meta-grid'>"
+        f"<div><b>⏱️ Prep Time:</b> {recipe.prep_time}</div>"
+        f"<div><b>📊 Difficulty:</b> {recipe.difficulty}</div>"
+        f"<div><b>🔥 Calories:</b> {calories} kcal</div>"
+        "</div>",
+        unsafe_allow_html=True
+    )
+    
+    st.markdown("---")
+    
+    # Ingredients
+    st.markdown("**🥘 Ingredients:**")
+    
+    # A substring hit always scores 100 with partial_ratio; fuzzy-score only the rest
+    matched = [
+        any(sel and (sel in ing or ing in sel) for sel in selected_lower)
+        for ing in recipe._ingredients_lower
+    ]
+    pending = [idx for idx, hit in enumerate(matched) if not hit]
+    if pending:
+        scores = process.cdist(
+            [recipe._ingredients_lower[idx] for idx in pending],
+            selected_lower,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=80,
+            dtype=np.uint8
+        )
+        for idx, hit in zip(pending, (scores > 80).any(axis=1)):
+            matched[idx] = bool(hit)
+    
+    for ing, is_matched in zip(recipe.ingredients, matched):
+        if is_matched:
+            st.markdown(f"- ✅ {ing} *(from your inventory)*")
+        else:
+            st.markdown(f"- {ing}")
+    
+    st.markdown("---")
+    
+    # Instructions
+    st.markdown("**👨‍🍳 Instructions:**")
+    st.markdown(recipe.instructions)
+    
+    st.markdown("---")
+    
+    # Nutrition
+    nutrition_html = RecipeEngine.format_recipe_card(recipe)
+    st.markdown(nutrition_html, unsafe_allow_html=True)
+    
+    # Feedback section
+    st.markdown("---")
+    st.markdown("**💬 Share Your Feedback:**")
+    feedback_key = f"feedback_{recipe.id}"
+    feedback = st.text_area(
+        "Did you try this recipe? Let us know how it turned out!",
+        key=feedback_key,
+        placeholder="Share your experience, modifications, or suggestions..."
+    )
+    
+    if st.button(f"Submit Feedback", key=f"submit_feedback_{recipe.id}"):
+        if feedback.strip():
+            if 'feedback' not in st.session_state:
+                st.session_state.feedback = {}
+            st.session_state.feedback[recipe.name] = {
+                'user': username,
+                'feedback': feedback,
+                'timestamp': datetime.now().isoformat()
+            }
+            st.success("✅ Thank you for your feedback!")
+        else:
+            st.warning("⚠️ Please enter some feedback before submitting.")
 
 
 # ========================= MAIN APPLICATION =========================
@@ -1113,6 +1337,9 @@ def main():
     # Initialize session state
     SessionManager.initialize()
     
+    # Refresh the cached date once per rerun
+    _refresh_today()
+    
     # Render header
     render_header()
     
@@ -1140,8 +1367,8 @@ def main():
     
     st.markdown("---")
     
-    # Statistics Dashboard
-    render_statistics_dashboard(username)
+    # Statistics Dashboard, filled in after the tabs have applied this run's changes
+    stats_slot = st.container()
     
     st.markdown("---")
     
@@ -1165,6 +1392,9 @@ def main():
     with tab4:
         render_recipes_tab(username)
     
+    with stats_slot:
+        render_statistics_dashboard(username)
+    
     # Footer
     st.markdown("---")
     st.markdown(